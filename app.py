@@ -11,7 +11,6 @@ Usage:
     streamlit run app.py
 """
 import streamlit as st
-import plotly.graph_objects as go
 from dotenv import load_dotenv
 import sys
 from pathlib import Path
@@ -19,10 +18,8 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.databases import VectorStore, GraphStore
-from src.retriever import HybridRetriever
-from src.orchestrator import create_multi_agent_system
-from src.models import create_models
+# Heavy imports (LangGraph, Qdrant/Neo4j clients, plotly) are deferred into
+# the cached functions below so first paint isn't import-bound.
 
 load_dotenv()
 
@@ -34,22 +31,76 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource(show_spinner="Initializing RAG system...")
+def get_stack():
+    """
+    Build the heavy RAG components once and share them across sessions/reruns.
+
+    Streamlit reruns the whole script on every interaction; without caching,
+    each rerun (and each browser tab) would reload embedding models and open
+    fresh Qdrant/Neo4j connections. Imports live here too, so the page
+    renders before LangGraph and the DB clients are even loaded.
+    """
+    from src.databases import VectorStore, GraphStore
+    from src.retriever import HybridRetriever
+    from src.orchestrator import create_multi_agent_system
+    from src.models import create_models
+
+    create_models()
+    vector_store = VectorStore(collection_name="acme_docs")
+    graph_store = GraphStore()
+    retriever = HybridRetriever(vector_store, graph_store, verbose=False)
+    agent_system = create_multi_agent_system(retriever)
+    return vector_store, graph_store, retriever, agent_system
+
+
+@st.cache_data(ttl=30)
+def get_collection_points_count(collection_name):
+    """Cached Qdrant collection stats (avoids a round-trip on every rerun)."""
+    vector_store, _, _, _ = get_stack()
+    return vector_store.client.get_collection(collection_name).points_count
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_retrieve(query, strategy, top_k):
+    """Memoized retrieval - repeat queries skip all backend round-trips."""
+    _, _, retriever, _ = get_stack()
+    return retriever.retrieve(query, top_k=top_k, strategy=strategy)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_agent_invoke(query, max_iterations):
+    """
+    Memoized full-pipeline run.
+
+    Warm-cache queries return instantly with zero LLM tokens spent, which
+    matters for the sample queries that get re-asked constantly.
+    """
+    _, _, _, agent_system = get_stack()
+    return agent_system.invoke({
+        "query": query,
+        "plan": "",
+        "retrieved_docs": [],
+        "best_docs": [],
+        "best_quality": 0.0,
+        "retrieval_quality": 0.0,
+        "feedback": "",
+        "iteration": 0,
+        "final_answer": "",
+        "max_iterations": max_iterations,
+        "skip_planning": False
+    })
+
+
 # Initialize session state
 if 'initialized' not in st.session_state:
-    with st.spinner("Initializing RAG system..."):
-        create_models()
-        st.session_state.vector_store = VectorStore(collection_name="acme_docs")
-        st.session_state.graph_store = GraphStore()
-        st.session_state.retriever = HybridRetriever(
-            st.session_state.vector_store, 
-            st.session_state.graph_store,
-            verbose=False
-        )
-        st.session_state.agent_system = create_multi_agent_system(
-            st.session_state.retriever
-        )
-        st.session_state.initialized = True
-        st.session_state.history = []
+    vector_store, graph_store, retriever, agent_system = get_stack()
+    st.session_state.vector_store = vector_store
+    st.session_state.graph_store = graph_store
+    st.session_state.retriever = retriever
+    st.session_state.agent_system = agent_system
+    st.session_state.initialized = True
+    st.session_state.history = []
 
 # Header
 st.title("Multi-Agent RAG System")
@@ -75,14 +126,17 @@ with st.sidebar:
     
     show_scores = st.checkbox("Show score breakdown", value=True)
     show_sources = st.checkbox("Show source documents", value=True)
+
+    if st.button("Clear query cache"):
+        st.cache_data.clear()
+        st.toast("Query cache cleared")
     
     st.divider()
     st.markdown("### System Stats")
     
     # Get collection info
     try:
-        collection_info = st.session_state.vector_store.client.get_collection("acme_docs")
-        st.metric("Vector Documents", collection_info.points_count)
+        st.metric("Vector Documents", get_collection_points_count("acme_docs"))
     except:
         st.metric("Vector Documents", "N/A")
     
@@ -96,9 +150,18 @@ with st.sidebar:
 # Main content
 col1, col2 = st.columns([2, 1])
 
-with col1:
+
+@st.fragment
+def query_panel():
+    """
+    Query interface fragment.
+
+    Runs as a Streamlit fragment so pressing Search (or editing the query)
+    only reruns this panel instead of the whole script — sidebar widgets and
+    the visualization column are left untouched.
+    """
     st.header("Query Interface")
-    
+
     # Sample queries
     sample_queries = [
         "Who is the CEO of Acme Corporation?",
@@ -118,22 +181,19 @@ with col1:
         if query:
             with st.spinner("Processing query..."):
                 if mode == "Retrieval Only":
-                    # Just retrieval
-                    results = st.session_state.retriever.retrieve(
-                        query, 
-                        top_k=top_k, 
-                        strategy=strategy
-                    )
-                    
+                    # Memoized retrieval - repeat queries are free
+                    results = cached_retrieve(query, strategy, top_k)
+
                     st.success(f"Retrieved {len(results)} results")
-                    
+
                     # Display results
                     for i, result in enumerate(results, 1):
-                        with st.expander(f"Result {i} - Score: {result.score:.4f}"):
+                        score = result.score if result.score is not None else 0.0
+                        with st.expander(f"Result {i} - Score: {score:.4f}"):
                             st.markdown(result.node.text)
                             if result.node.metadata:
                                 st.json(result.node.metadata)
-                    
+
                     # Store in history
                     st.session_state.history.append({
                         "query": query,
@@ -143,23 +203,8 @@ with col1:
                     })
                     
                 else:
-                    # Full multi-agent system
-                    state = {
-                        "query": query,
-                        "plan": "",
-                        "retrieved_docs": [],
-                        "best_docs": [],
-                        "best_quality": 0.0,
-                        "retrieval_quality": 0.0,
-                        "feedback": "",
-                        "iteration": 0,
-                        "final_answer": "",
-                        "max_iterations": 3,
-                        "skip_planning": False
-                    }
-                    
-                    # Run agent system
-                    final_state = st.session_state.agent_system.invoke(state)
+                    # Full multi-agent system (memoized end-to-end)
+                    final_state = cached_agent_invoke(query, 3)
                     
                     # Display answer
                     st.success("Answer Generated")
@@ -169,12 +214,13 @@ with col1:
                     # Show iterations
                     st.info(f"Completed in {final_state.get('iteration', 0)} iterations | Quality Score: {final_state.get('retrieval_quality', 0):.2f}")
                     
-                    # Show documents used
-                    if show_sources and final_state.get("best_docs"):
+                    # Show documents used (pre-truncated by the Analyst so
+                    # only small preview strings hit session state)
+                    if show_sources and final_state.get("best_docs_preview"):
                         st.markdown("### Source Documents")
-                        for i, doc in enumerate(final_state["best_docs"][:3], 1):
+                        for i, preview in enumerate(final_state["best_docs_preview"], 1):
                             with st.expander(f"Source {i}"):
-                                st.markdown(doc.node.text[:500] + "...")
+                                st.markdown(preview + "...")
                     
                     # Store in history
                     st.session_state.history.append({
@@ -184,26 +230,47 @@ with col1:
                         "score": final_state.get('retrieval_quality', 0)
                     })
 
-with col2:
+@st.cache_resource
+def weights_fig():
+    """
+    Static pie chart of the hybrid retrieval weights.
+
+    The values never change at runtime, so build the figure once instead of
+    re-creating and re-serializing it on every rerun. Plotly is imported
+    lazily - it's only needed when this chart is actually rendered.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[go.Pie(
+        labels=['Vector Search', 'BM25 Keyword', 'Graph Traversal'],
+        values=[60, 30, 10],
+        marker=dict(colors=['#FF6B6B', '#4ECDC4', '#45B7D1']),
+        hole=.3
+    )])
+    fig.update_layout(
+        title="Hybrid Retrieval Distribution",
+        height=300,
+        margin=dict(t=50, b=0, l=0, r=0)
+    )
+    return fig
+
+
+@st.fragment
+def viz_panel():
+    """
+    Visualization fragment.
+
+    Isolated from the query panel so chart/history rendering doesn't rerun
+    the retrieval widgets (and vice versa).
+    """
     st.header("Visualizations")
     
     if show_scores and st.session_state.history:
         st.markdown("### Retrieval Weights")
         
-        # Create pie chart for hybrid retrieval weights
+        # Pie chart for hybrid retrieval weights (cached - it's static)
         if strategy == "hybrid":
-            fig = go.Figure(data=[go.Pie(
-                labels=['Vector Search', 'BM25 Keyword', 'Graph Traversal'],
-                values=[60, 30, 10],
-                marker=dict(colors=['#FF6B6B', '#4ECDC4', '#45B7D1']),
-                hole=.3
-            )])
-            fig.update_layout(
-                title="Hybrid Retrieval Distribution",
-                height=300,
-                margin=dict(t=50, b=0, l=0, r=0)
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(weights_fig(), use_container_width=True)
         
         st.markdown("### Query History")
         
@@ -218,6 +285,13 @@ with col2:
                 if 'results' in item:
                     st.markdown(f"**Results:** {item['results']}")
 
+
+with col1:
+    query_panel()
+
+with col2:
+    viz_panel()
+
 # Architecture diagram
 with st.expander("System Architecture"):
     st.markdown("""
@@ -0,0 +1,97 @@
+"""
+Qdrant Synthetic Benchmark
+
+Measures raw upsert and search throughput against the local Qdrant instance
+using synthetic vectors, independent of the embedding model.
+
+Vectors are generated in bulk with numpy (`np.random.rand(n, dim)`) rather
+than per-vector Python list comprehensions: a single vectorized fill avoids
+boxing 512 floats per vector into Python objects, and the array is handed to
+the client as-is (one C-level conversion at the boundary).
+
+Usage:
+    python scripts/benchmark_qdrant.py
+    python scripts/benchmark_qdrant.py --num-vectors 10000 --dim 512
+"""
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client import models as qdrant_models
+
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Qdrant synthetic throughput benchmark')
+    parser.add_argument('--num-vectors', type=int, default=5000,
+                       help='Number of synthetic vectors to upsert (default: 5000)')
+    parser.add_argument('--dim', type=int, default=512,
+                       help='Vector dimensionality (default: 512)')
+    parser.add_argument('--num-queries', type=int, default=100,
+                       help='Number of search queries to run (default: 100)')
+    parser.add_argument('--collection', default='benchmark_synthetic',
+                       help='Collection name (default: benchmark_synthetic)')
+
+    args = parser.parse_args()
+
+    client = QdrantClient(
+        url=os.getenv("QDRANT_URL", "http://localhost:6333"),
+        prefer_grpc=True
+    )
+
+    print(f"\nQdrant Synthetic Benchmark ({args.num_vectors} x {args.dim})\n" + "=" * 60)
+
+    # Bulk-generate all vectors in one vectorized call - no per-vector
+    # Python loops or .tolist() boxing
+    rng = np.random.default_rng(seed=42)
+    vectors = rng.random((args.num_vectors, args.dim), dtype=np.float32)
+    query_vectors = rng.random((args.num_queries, args.dim), dtype=np.float32)
+
+    if client.collection_exists(args.collection):
+        client.delete_collection(args.collection)
+    client.create_collection(
+        collection_name=args.collection,
+        vectors_config=qdrant_models.VectorParams(
+            size=args.dim,
+            distance=qdrant_models.Distance.COSINE
+        )
+    )
+
+    start = time.perf_counter()
+    client.upload_collection(
+        collection_name=args.collection,
+        vectors=vectors,
+        ids=range(args.num_vectors),
+        batch_size=256,
+        parallel=4
+    )
+    upsert_time = time.perf_counter() - start
+    print(f"Upsert: {args.num_vectors} vectors in {upsert_time:.2f}s "
+          f"({args.num_vectors / upsert_time:.0f} vec/s)")
+
+    start = time.perf_counter()
+    for query_vector in query_vectors:
+        client.query_points(
+            collection_name=args.collection,
+            query=query_vector,
+            limit=5
+        )
+    search_time = time.perf_counter() - start
+    print(f"Search: {args.num_queries} queries in {search_time:.2f}s "
+          f"({args.num_queries / search_time:.0f} qps)")
+
+    client.delete_collection(args.collection)
+    print("\n" + "=" * 60)
+    print("Benchmark complete")
+
+
+if __name__ == "__main__":
+    main()
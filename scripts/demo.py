@@ -8,57 +8,100 @@ Demonstrates the complete multi-agent retrieval workflow including:
 4. Specialized agent collaboration: Planner, Retriever, Reviewer, Analyst
 
 Usage:
+    # Interactive walkthrough
     python scripts/demo.py
+
+    # Run all demo queries concurrently (no prompts)
+    python scripts/demo.py --batch
 """
 import sys
+import asyncio
+import argparse
+import logging
 from pathlib import Path
 from dotenv import load_dotenv
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.databases import VectorStore, GraphStore
-from src.retriever import HybridRetriever
-from src.orchestrator import create_multi_agent_system
-from src.models import create_models
-
 load_dotenv()
 
+# The agents log their progress; surface it on the console for the demo
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+def make_state(query, max_iterations=3):
+    """Build the initial AgentState dict for a query."""
+    return {
+        "query": query,
+        "plan": "",
+        "retrieved_docs": [],
+        "retrieval_quality": 0.0,
+        "feedback": "",
+        "iteration": 0,
+        "final_answer": "",
+        "max_iterations": max_iterations
+    }
+
+
+async def run_batch(agent_system, queries):
+    """
+    Run all demo queries concurrently via LangGraph's async invoke.
+
+    The workload is LLM/network latency-bound, so overlapping the queries
+    brings total wall time close to the slowest single query.
+    """
+    return await asyncio.gather(
+        *[agent_system.ainvoke(make_state(q)) for q in queries]
+    )
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Multi-Agent RAG demo')
+    parser.add_argument('--batch', action='store_true',
+                       help='Run all demo queries concurrently, without prompts')
+    args = parser.parse_args()
+
+    # Heavy imports deferred past argparse so --help stays instant
+    from src.databases import VectorStore, GraphStore
+    from src.retriever import HybridRetriever
+    from src.orchestrator import create_multi_agent_system
+    from src.models import create_models
+
     print("\nMulti-Agent Self-Correcting RAG Demo\n" + "="*70)
-    
+
     create_models()
-    
+
     vector_store = VectorStore(collection_name="acme_docs")
     graph_store = GraphStore()
     retriever = HybridRetriever(vector_store, graph_store)
     agent_system = create_multi_agent_system(retriever=retriever, max_iterations=3)
-    
+
     print("System initialized\n")
-    
+
     demo_queries = [
         "Who is the CEO of Acme Corporation?",
         "What is Project Phoenix and who leads it?",
         "What are the parental leave benefits for new fathers?"
     ]
-    
+
+    if args.batch:
+        results = asyncio.run(run_batch(agent_system, demo_queries))
+        for i, (query, result) in enumerate(zip(demo_queries, results), 1):
+            print(f"\nQuery {i}/{len(demo_queries)}: {query}")
+            print("-" * 70)
+            print(f"\n{result['final_answer']}")
+            print(f"\n[Iterations: {result['iteration']} | Quality: {result['retrieval_quality']:.2f}]")
+        return
+
     for i, query in enumerate(demo_queries, 1):
         print(f"\nQuery {i}/{len(demo_queries)}: {query}")
         print("-" * 70)
-        
-        result = agent_system.invoke({
-            "query": query,
-            "plan": "",
-            "retrieved_docs": [],
-            "retrieval_quality": 0.0,
-            "feedback": "",
-            "iteration": 0,
-            "final_answer": "",
-            "max_iterations": 3
-        })
-        
+
+        result = agent_system.invoke(make_state(query))
+
         print(f"\n{result['final_answer']}")
         print(f"\n[Iterations: {result['iteration']} | Quality: {result['retrieval_quality']:.2f}]")
-        
+
         if i < len(demo_queries):
             input("\nPress Enter for next query...")
     
@@ -75,16 +118,7 @@ def main():
             if not question:
                 continue
             
-            result = agent_system.invoke({
-                "query": question,
-                "plan": "",
-                "retrieved_docs": [],
-                "retrieval_quality": 0.0,
-                "feedback": "",
-                "iteration": 0,
-                "final_answer": "",
-                "max_iterations": 3
-            })
+            result = agent_system.invoke(make_state(question))
             
             print(f"\n{result['final_answer']}")
             print(f"\n[Iterations: {result['iteration']} | Quality: {result['retrieval_quality']:.2f}]\n")
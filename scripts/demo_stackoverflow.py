@@ -9,24 +9,61 @@ Usage:
     
     # Then run demo:
     python scripts/demo_engineering.py
+
+    # Run all demo queries concurrently (no prompts)
+    python scripts/demo_stackoverflow.py --batch
 """
 import sys
+import asyncio
+import argparse
+import logging
 from pathlib import Path
 from dotenv import load_dotenv
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.databases import VectorStore, GraphStore
-from src.retriever import HybridRetriever
-from src.orchestrator import create_multi_agent_system
-from src.models import create_models
-
 load_dotenv()
 
+# The agents log their progress; surface it on the console for the demo
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+def make_state(query, max_iterations=3):
+    """Build the initial AgentState dict for a query."""
+    return {
+        "query": query,
+        "plan": "",
+        "retrieved_docs": [],
+        "retrieval_quality": 0.0,
+        "feedback": "",
+        "iteration": 0,
+        "final_answer": "",
+        "max_iterations": max_iterations,
+        "skip_planning": True
+    }
+
+
+async def run_batch(agent_system, queries):
+    """Run all demo queries concurrently via LangGraph's async invoke."""
+    return await asyncio.gather(
+        *[agent_system.ainvoke(make_state(q)) for q in queries]
+    )
+
 
 def main():
+    parser = argparse.ArgumentParser(description='Python Stack Overflow RAG demo')
+    parser.add_argument('--batch', action='store_true',
+                       help='Run all demo queries concurrently, without prompts')
+    args = parser.parse_args()
+
+    # Heavy imports deferred past argparse so --help stays instant
+    from src.databases import VectorStore, GraphStore
+    from src.retriever import HybridRetriever
+    from src.orchestrator import create_multi_agent_system
+    from src.models import create_models
+
     print("\n� Python Multi-Agent RAG Demo\n" + "="*70)
-    
+
     create_models()
     
     # Use Python Q&A collection
@@ -45,27 +82,28 @@ def main():
     ]
     
     print("Running demo queries...\n")
-    
+
+    if args.batch:
+        results = asyncio.run(run_batch(agent_system, demo_queries))
+        for i, (query, result) in enumerate(zip(demo_queries, results), 1):
+            print(f"\n{'='*70}")
+            print(f"Query {i}/{len(demo_queries)}: {query}")
+            print("="*70)
+            print(f"\n📊 ANSWER:\n{result['final_answer']}")
+            print(f"\n[Iterations: {result['iteration']} | Quality: {result['retrieval_quality']:.2f}]")
+        print("\n👋 Thanks for using Python RAG!")
+        return
+
     for i, query in enumerate(demo_queries, 1):
         print(f"\n{'='*70}")
         print(f"Query {i}/{len(demo_queries)}: {query}")
         print("="*70)
-        
-        result = agent_system.invoke({
-            "query": query,
-            "plan": "",
-            "retrieved_docs": [],
-            "retrieval_quality": 0.0,
-            "feedback": "",
-            "iteration": 0,
-            "final_answer": "",
-            "max_iterations": 3,
-            "skip_planning": True
-        })
-        
+
+        result = agent_system.invoke(make_state(query))
+
         print(f"\n📊 ANSWER:\n{result['final_answer']}")
         print(f"\n[Iterations: {result['iteration']} | Quality: {result['retrieval_quality']:.2f}]")
-        
+
         if i < len(demo_queries):
             input("\nPress Enter for next query...")
     
@@ -89,17 +127,7 @@ def main():
             if not question:
                 continue
             
-            result = agent_system.invoke({
-                "query": question,
-                "plan": "",
-                "retrieved_docs": [],
-                "retrieval_quality": 0.0,
-                "feedback": "",
-                "iteration": 0,
-                "final_answer": "",
-                "max_iterations": 3,
-                "skip_planning": True
-            })
+            result = agent_system.invoke(make_state(question))
             
             print(f"\n📊 ANSWER:\n{result['final_answer']}")
             print(f"\n[Iterations: {result['iteration']} | Quality: {result['retrieval_quality']:.2f}]")
@@ -13,61 +13,87 @@ Usage:
 """
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from llama_index.core import Document
+from src.checkpoint import load_checkpoint, append_checkpoint, retry_with_backoff
 from src.databases import VectorStore, GraphStore
 from src.models import create_models
 
 load_dotenv()
 
 
-def load_documents_with_docling(docs_path):
+def _convert_pdf(file_path):
+    """
+    Convert a single PDF to Markdown with Docling.
+
+    Runs in a worker process, so the (non-picklable) DocumentConverter is
+    constructed locally rather than shared from the parent.
+    """
+    from docling.document_converter import DocumentConverter
+
+    converter = DocumentConverter()
+    result = converter.convert(str(file_path))
+    return str(file_path), result.document.export_to_markdown()
+
+
+def load_documents_with_docling(docs_path, max_workers=None):
     """
     Load documents using Docling for layout-aware parsing.
-    
+
     Docling converts PDFs to structured Markdown, preserving:
     - Headers (# ## ###) for hierarchical structure
     - Tables (| | |) for tabular data
     - Multi-column layouts
-    
-    For non-PDF files, falls back to simple text loading.
+
+    PDF conversion is CPU-bound (layout model inference) and independent per
+    file, so PDFs are parsed in parallel across processes. Non-PDF files
+    fall back to simple text loading.
     """
-    from docling.document_converter import DocumentConverter
-    
-    converter = DocumentConverter()
     documents = []
-    
+    pdf_paths = []
+
     for file_path in Path(docs_path).glob("**/*"):
-        if file_path.is_file():
+        if not file_path.is_file():
+            continue
+        if file_path.suffix.lower() == '.pdf':
+            pdf_paths.append(file_path)
+        else:
             try:
-                if file_path.suffix.lower() == '.pdf':
-                    # Use Docling for PDFs - converts to structured Markdown
-                    result = converter.convert(str(file_path))
-                    markdown_text = result.document.export_to_markdown()
-                    
+                # Plain text files
+                text = file_path.read_text(encoding='utf-8')
+                doc = Document(
+                    text=text,
+                    metadata={"file_name": file_path.name, "file_path": str(file_path)}
+                )
+                documents.append(doc)
+                print(f"✓ Loaded (text): {file_path.name}")
+            except Exception as e:
+                print(f"✗ Failed to load {file_path.name}: {e}")
+                continue
+
+    if pdf_paths:
+        max_workers = max_workers or min(len(pdf_paths), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_convert_pdf, p): p for p in pdf_paths}
+            for future in futures:
+                pdf_path = futures[future]
+                try:
+                    _, markdown_text = future.result()
                     doc = Document(
                         text=markdown_text,
-                        metadata={"file_name": file_path.name, "file_path": str(file_path)}
+                        metadata={"file_name": pdf_path.name, "file_path": str(pdf_path)}
                     )
                     documents.append(doc)
-                    print(f"✓ Loaded (Docling): {file_path.name}")
-                else:
-                    # Plain text files
-                    text = file_path.read_text(encoding='utf-8')
-                    doc = Document(
-                        text=text,
-                        metadata={"file_name": file_path.name, "file_path": str(file_path)}
-                    )
-                    documents.append(doc)
-                    print(f"✓ Loaded (text): {file_path.name}")
-            except Exception as e:
-                print(f"✗ Failed to load {file_path.name}: {e}")
-                continue
-    
+                    print(f"✓ Loaded (Docling): {pdf_path.name}")
+                except Exception as e:
+                    print(f"✗ Failed to load {pdf_path.name}: {e}")
+                    continue
+
     return documents
 
 
@@ -81,7 +107,7 @@ def main():
     print(f"\nLoaded {len(documents)} documents")
     
     print("\nCreating hierarchical chunks (Parent → Children)...")
-    vector_store = VectorStore(collection_name="acme_docs")
+    vector_store = VectorStore(collection_name="acme_docs", prefer_grpc=True)
     vector_store.index_documents(documents, use_hierarchical=True)
     print("✓ Vector indexing complete with parent-child hierarchy")
     
@@ -92,30 +118,28 @@ def main():
     else:
         print("Building knowledge graph...")
         graph_store = GraphStore()
-        
-        success_count = 0
-        for i, doc in enumerate(documents, 1):
+
+        # Resume support: skip documents already recorded in the checkpoint,
+        # so a crashed run doesn't redo triplet extraction for the whole corpus
+        checkpoint_path = Path(__file__).parent.parent / "data" / ".checkpoints" / "acme_graph.jsonl"
+        processed = load_checkpoint(checkpoint_path)
+        pending = [d for d in documents if d.metadata.get('file_name') not in processed]
+
+        if not pending:
+            print(f"Graph already up to date ({len(processed)} documents checkpointed)")
+        else:
+            if processed:
+                print(f"Resuming graph build: {len(processed)} done, {len(pending)} remaining")
+
+            # Build the graph from all pending documents in one batched call,
+            # retrying transient LLM/Neo4j failures with backoff.
             try:
-                if i == 1:
-                    graph_store.build_graph([doc], max_triplets=2)
-                else:
-                    from llama_index.core import KnowledgeGraphIndex
-                    new_index = KnowledgeGraphIndex.from_documents(
-                        [doc],
-                        storage_context=graph_store.storage_context,
-                        max_triplets_per_chunk=2,
-                        include_embeddings=True,
-                        show_progress=False
-                    )
-                    graph_store.index = new_index
-                success_count += 1
+                retry_with_backoff(lambda: graph_store.build_graph(pending, max_triplets=2))
+                for doc in pending:
+                    append_checkpoint(checkpoint_path, doc.metadata.get('file_name'))
+                print(f"Graph building complete ({len(pending)} documents)")
             except Exception as e:
-                continue
-        
-        if success_count > 0:
-            print(f"Graph building complete ({success_count}/{len(documents)} documents)")
-        else:
-            print("Graph building failed (Vector + BM25 only)")
+                print(f"Graph building failed (Vector + BM25 only): {e}")
     
     print("\n" + "="*60)
     print("Indexing complete. Run: python scripts/demo.py")
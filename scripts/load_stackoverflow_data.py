@@ -15,6 +15,8 @@ Usage:
 """
 import os
 import sys
+import math
+import asyncio
 import argparse
 from pathlib import Path
 from dotenv import load_dotenv
@@ -22,6 +24,7 @@ from dotenv import load_dotenv
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from llama_index.core import Document
+from src.checkpoint import load_checkpoint, append_checkpoint
 from src.databases import VectorStore, GraphStore
 from src.models import create_models
 
@@ -37,25 +40,36 @@ class StackOverflowLoader:
     def load_questions(self, tag, max_results=50, min_score=10):
         """
         Load questions by tag
-        
+
         Args:
             tag: Tag to filter (e.g., 'python', 'machine-learning', 'docker')
             max_results: Maximum number of questions to fetch
             min_score: Minimum question score to include
         """
-        import requests
-        import time
-        
+        return asyncio.run(self.aload_questions(tag, max_results, min_score))
+
+    async def aload_questions(self, tag, max_results=50, min_score=10):
+        """
+        Fetch all result pages concurrently with aiohttp.
+
+        The page count is known upfront (max_results / page_size), so instead
+        of fetching pages one-by-one and sleeping between requests, all pages
+        are requested at once behind a small semaphore that honors the Stack
+        Exchange rate limit. Total wall time drops from pages × RTT to
+        roughly one RTT.
+        """
+        import aiohttp
+
         print(f"\n📥 Loading Stack Overflow questions tagged '{tag}'...")
-        
-        documents = []
-        page = 1
+
         page_size = 100
-        
-        while len(documents) < max_results:
+        num_pages = math.ceil(max_results / page_size)
+        sem = asyncio.Semaphore(5)
+
+        async def fetch_page(session, page):
             params = {
                 'page': page,
-                'pagesize': min(page_size, max_results - len(documents)),
+                'pagesize': min(page_size, max_results - (page - 1) * page_size),
                 'order': 'desc',
                 'sort': 'votes',
                 'tagged': tag,
@@ -63,18 +77,40 @@ class StackOverflowLoader:
                 'filter': 'withbody',  # Include question body
                 'min': min_score
             }
-            
-            try:
-                response = requests.get(f"{self.base_url}/questions", params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                if 'items' not in data or not data['items']:
+            async with sem:
+                # A 429 means we outran the Stack Exchange rate limit:
+                # honor Retry-After (holding the semaphore, which throttles
+                # the other in-flight requests too) and retry instead of
+                # silently dropping the page from the corpus
+                for attempt in range(3):
+                    try:
+                        async with session.get(f"{self.base_url}/questions", params=params) as response:
+                            if response.status == 429:
+                                delay = float(response.headers.get('Retry-After', 2 ** attempt))
+                                print(f"\n   Rate limited on page {page}, retrying in {delay:.0f}s...")
+                                await asyncio.sleep(delay)
+                                continue
+                            response.raise_for_status()
+                            data = await response.json()
+                            return data.get('items', [])
+                    except Exception as e:
+                        print(f"\n   Error loading page {page}: {e}")
+                        return []
+                print(f"\n   Error loading page {page}: still rate limited after retries")
+                return []
+
+        async with aiohttp.ClientSession() as session:
+            pages = await asyncio.gather(
+                *[fetch_page(session, page) for page in range(1, num_pages + 1)]
+            )
+
+        documents = []
+        for items in pages:
+            for item in items:
+                if len(documents) >= max_results:
                     break
-                
-                for item in data['items']:
-                    # Combine question title and body
-                    text = f"""# {item['title']}
+                # Combine question title and body
+                text = f"""# {item['title']}
 
 **Score**: {item['score']} | **Views**: {item['view_count']} | **Answers**: {item['answer_count']}
 
@@ -85,35 +121,22 @@ class StackOverflowLoader:
 **Asked**: {item.get('creation_date', 'N/A')}
 **Link**: {item.get('link', 'N/A')}
 """
-                    
-                    doc = Document(
-                        text=text,
-                        metadata={
-                            'source': 'stackoverflow',
-                            'question_id': item['question_id'],
-                            'title': item['title'],
-                            'tags': item.get('tags', []),
-                            'score': item['score'],
-                            'answer_count': item['answer_count'],
-                            'link': item.get('link', '')
-                        }
-                    )
-                    documents.append(doc)
-                
-                print(f"   Loaded {len(documents)}/{max_results} questions...", end='\r')
-                
-                # Check if there are more pages
-                if not data.get('has_more', False):
-                    break
-                
-                page += 1
-                time.sleep(0.1)  # Rate limiting
-                
-            except Exception as e:
-                print(f"\n   Error loading page {page}: {e}")
-                break
-        
-        print(f"\n✓ Loaded {len(documents)} Stack Overflow questions")
+
+                doc = Document(
+                    text=text,
+                    metadata={
+                        'source': 'stackoverflow',
+                        'question_id': item['question_id'],
+                        'title': item['title'],
+                        'tags': item.get('tags', []),
+                        'score': item['score'],
+                        'answer_count': item['answer_count'],
+                        'link': item.get('link', '')
+                    }
+                )
+                documents.append(doc)
+
+        print(f"✓ Loaded {len(documents)} Stack Overflow questions")
         return documents
 
 
@@ -154,7 +177,7 @@ def main():
     
     # Index documents
     print("\n📊 Indexing into vector database...")
-    vector_store = VectorStore(collection_name='stackoverflow_docs')
+    vector_store = VectorStore(collection_name='stackoverflow_docs', prefer_grpc=True)
     vector_store.index_documents(all_documents)
     print("✓ Vector indexing complete")
     
@@ -162,32 +185,31 @@ def main():
     if not args.skip_graph:
         print("\n🕸️  Building knowledge graph...")
         graph_store = GraphStore()
-        
-        # Process in batches to avoid memory issues
-        batch_size = 5
-        success_count = 0
-        
-        for i in range(0, len(all_documents), batch_size):
-            batch = all_documents[i:i+batch_size]
+
+        # Resume support: each successful insert is checkpointed by question
+        # id, so a crashed or interrupted run picks up where it left off
+        checkpoint_path = Path(__file__).parent.parent / "data" / ".checkpoints" / "stackoverflow_graph.jsonl"
+        processed = load_checkpoint(checkpoint_path)
+        pending = [d for d in all_documents
+                   if d.metadata.get('question_id') not in processed]
+
+        if not pending:
+            print(f"\n✓ Graph already up to date ({len(processed)} documents checkpointed)")
+        else:
+            if processed:
+                print(f"   Resuming graph build: {len(processed)} done, {len(pending)} remaining")
+
+            # Stream documents into a single index so the triplet extractor
+            # stays saturated and one bad document can't stall the rest.
             try:
-                if i == 0:
-                    graph_store.build_graph(batch, max_triplets=2)
-                else:
-                    from llama_index.core import KnowledgeGraphIndex
-                    new_index = KnowledgeGraphIndex.from_documents(
-                        batch,
-                        storage_context=graph_store.storage_context,
-                        max_triplets_per_chunk=2,
-                        include_embeddings=True,
-                        show_progress=False
-                    )
-                    graph_store.index = new_index
-                success_count += len(batch)
-                print(f"   Processed {min(i+batch_size, len(all_documents))}/{len(all_documents)} documents...", end='\r')
+                _, inserted = graph_store.build_graph_streaming(
+                    pending, max_triplets=2, max_workers=10,
+                    on_success=lambda doc: append_checkpoint(
+                        checkpoint_path, doc.metadata.get('question_id'))
+                )
+                print(f"\n✓ Graph building complete ({inserted}/{len(pending)} documents)")
             except Exception as e:
-                continue
-        
-        print(f"\n✓ Graph building complete ({success_count}/{len(all_documents)} documents)")
+                print(f"\n✗ Graph building failed: {e}")
     else:
         print("\n⏭️  Skipping graph build (use --skip-graph=false to enable)")
     
@@ -0,0 +1,74 @@
+"""
+Indexing Checkpoint Helpers
+
+Tracks which documents have already been indexed so long-running indexing
+jobs can resume after a crash instead of re-embedding and re-extracting
+triplets for the whole corpus.
+
+Checkpoints are append-only JSONL files (one {"id": ...} record per line),
+so partial writes from a crash corrupt at most the final line.
+"""
+import json
+import time
+from pathlib import Path
+
+
+def load_checkpoint(path):
+    """
+    Load the set of already-processed document ids.
+
+    Args:
+        path: Checkpoint file path (missing file means nothing processed)
+
+    Returns:
+        set: Processed document ids
+    """
+    path = Path(path)
+    if not path.exists():
+        return set()
+
+    processed = set()
+    for line in path.read_text(encoding='utf-8').splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            processed.add(json.loads(line)['id'])
+        except (json.JSONDecodeError, KeyError):
+            # Torn final line from a crash mid-write - ignore it
+            continue
+    return processed
+
+
+def append_checkpoint(path, doc_id):
+    """Record a successfully processed document id."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('a', encoding='utf-8') as f:
+        f.write(json.dumps({'id': doc_id}) + '\n')
+
+
+def retry_with_backoff(fn, max_attempts=3, base_delay=2.0):
+    """
+    Call fn(), retrying transient failures with exponential backoff.
+
+    Args:
+        fn: Zero-argument callable
+        max_attempts: Total attempts before giving up
+        base_delay: First retry delay in seconds (doubles per attempt)
+
+    Returns:
+        fn's return value
+
+    Raises:
+        The last exception if all attempts fail.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return fn()
+        except Exception:
+            if attempt == max_attempts:
+                raise
+            delay = base_delay * (2 ** (attempt - 1))
+            print(f"   Attempt {attempt} failed, retrying in {delay:.0f}s...")
+            time.sleep(delay)
@@ -15,12 +15,82 @@ Deduplication Strategy:
 - Ensures final result set contains only unique documents
 """
 import os
+import asyncio
+import contextvars
+import functools
+import heapq
+import logging
+import operator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+import numpy as np
+import xxhash
 from langsmith import traceable
 from llama_index.core.schema import NodeWithScore, TextNode
 from llama_index.core import SimpleDirectoryReader
 from llama_index.retrievers.bm25 import BM25Retriever
 
+logger = logging.getLogger(__name__)
+
+# RRF constant and the rank range covered by the precomputed table
+_RRF_K = 60
+_RRF_LUT_RANKS = 64
+
+
+@functools.lru_cache(maxsize=4)
+def _build_or_load_bm25(docs_path_str, fingerprint, top_k):
+    """
+    Build (or load from the persist cache) a BM25 retriever for a corpus.
+
+    Module-scope and memoized on (path, fingerprint, top_k): every
+    HybridRetriever in the process shares one retriever per corpus version
+    instead of each re-reading and re-tokenizing the documents. The
+    fingerprint keys both this memo and the on-disk persist cache, so any
+    corpus change invalidates both.
+    """
+    cache_dir = Path(docs_path_str).parent / ".bm25_cache" / fingerprint
+
+    if cache_dir.exists():
+        try:
+            retriever = BM25Retriever.from_persist_dir(str(cache_dir))
+            retriever.similarity_top_k = top_k
+            return retriever
+        except Exception:
+            # Stale or incompatible cache - fall through and rebuild
+            pass
+
+    documents = SimpleDirectoryReader(docs_path_str).load_data()
+    # Fingerprint each node's leading text once at ingest; _merge_results
+    # picks the key up from metadata instead of hashing on the hot path
+    nodes = [
+        TextNode(
+            text=doc.text,
+            metadata={
+                **doc.metadata,
+                '_dedup_key': xxhash.xxh3_64_intdigest(
+                    doc.text[:200].encode('utf-8', 'ignore')
+                )
+            }
+        )
+        for doc in documents
+    ]
+    if not nodes:
+        return None
+
+    retriever = BM25Retriever.from_defaults(
+        nodes=nodes,
+        similarity_top_k=top_k
+    )
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        retriever.persist(str(cache_dir))
+    except Exception:
+        # Persisting is best-effort; the in-memory retriever still works
+        pass
+
+    return retriever
+
 
 class HybridRetriever:
     """
@@ -46,6 +116,26 @@ class HybridRetriever:
         self.graph_store = graph_store
         self.bm25_retriever = None  # Lazy initialization
         self.verbose = verbose
+        # Shared worker pool for fanning out the three backends; an
+        # instance attribute so repeated queries don't churn threads
+        self._executor = ThreadPoolExecutor(max_workers=3)
+        # Precomputed weight/(k+rank+1) tables per weights tuple: the hot
+        # merge loop reads an array cell instead of dividing per node.
+        # Warm the default hybrid weights up front.
+        self._rrf_luts = {}
+        self._get_rrf_lut((0.6, 0.1, 0.3))
+
+    def _get_rrf_lut(self, weights):
+        """Return (building if needed) the RRF table for a weights tuple."""
+        key = tuple(weights)
+        lut = self._rrf_luts.get(key)
+        if lut is None:
+            lut = np.array([
+                [w / (_RRF_K + r + 1) for r in range(_RRF_LUT_RANKS)]
+                for w in key
+            ])
+            self._rrf_luts[key] = lut
+        return lut
     
     @traceable(name="hybrid_retrieve", tags=["retrieval", "hybrid"])
     def retrieve(self, query, top_k=5, strategy="hybrid"):
@@ -67,16 +157,164 @@ class HybridRetriever:
             return self._bm25_search(query, top_k)
         
         else:
-            vector_results = self._vector_search_traced(query, top_k)
-            graph_results = self._graph_search_traced(query, top_k)
-            bm25_results = self._bm25_search_traced(query, top_k)
-            
+            # The three backends are independent I/O round-trips (Qdrant,
+            # Neo4j, local BM25) - issue them together so hybrid latency is
+            # the slowest backend rather than the sum of all three
+            vector_future = self._submit_traced(self._vector_search_traced, query, top_k)
+            graph_future = self._submit_traced(self._graph_search_traced, query, top_k)
+            bm25_future = self._submit_traced(self._bm25_search_traced, query, top_k)
+
+            vector_results = vector_future.result()
+            graph_results = graph_future.result()
+            bm25_results = bm25_future.result()
+
             return self._merge_results(
                 [vector_results, graph_results, bm25_results], 
                 weights=[0.6, 0.1, 0.3],
                 top_k=top_k
             )
     
+    async def aretrieve(self, query, top_k=5, strategy="hybrid"):
+        """
+        Async variant of retrieve().
+
+        The backend clients are synchronous, so each search runs in a worker
+        thread via asyncio.to_thread; for hybrid the three backends are
+        awaited together with asyncio.gather, collapsing retrieval latency
+        to the slowest backend instead of the sum of all three. Fusion and
+        deduplication are identical to the sync path.
+        """
+        if strategy == "vector_only":
+            return await asyncio.to_thread(self.vector_store.search, query, top_k)
+
+        elif strategy == "graph_only":
+            return await asyncio.to_thread(self.graph_store.search, query, top_k)
+
+        elif strategy == "bm25_only":
+            return await asyncio.to_thread(self._bm25_search, query, top_k)
+
+        else:
+            vector_results, graph_results, bm25_results = await asyncio.gather(
+                asyncio.to_thread(self._vector_search_traced, query, top_k),
+                asyncio.to_thread(self._graph_search_traced, query, top_k),
+                asyncio.to_thread(self._bm25_search_traced, query, top_k)
+            )
+
+            return self._merge_results(
+                [vector_results, graph_results, bm25_results],
+                weights=[0.6, 0.1, 0.3],
+                top_k=top_k
+            )
+
+    async def retrieve_batch(self, queries, top_k=5, strategy="hybrid", max_concurrency=8):
+        """
+        Retrieve for many queries concurrently.
+
+        The vector backend goes through VectorStore.search_batch, so all N
+        query vectors ship to Qdrant in one RPC; graph and BM25 have no
+        batched API and fan out per query (BM25 is local anyway), bounded
+        by a semaphore so the backends aren't flooded. For N queries the
+        critical path approaches a single query's latency instead of N of
+        them stacked end to end.
+
+        Args:
+            queries: List of query strings
+            top_k: How many documents to return per query
+            strategy: Retrieval strategy applied to every query
+            max_concurrency: Maximum queries in flight at once
+
+        Returns:
+            List of result lists, in the same order as queries
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        if strategy == "vector_only":
+            return await asyncio.to_thread(
+                self.vector_store.search_batch, queries, top_k
+            )
+
+        if strategy == "hybrid":
+            async def _graph_and_bm25(query):
+                async with semaphore:
+                    return await asyncio.gather(
+                        asyncio.to_thread(self._graph_search_traced, query, top_k),
+                        asyncio.to_thread(self._bm25_search_traced, query, top_k)
+                    )
+
+            vector_lists, other_lists = await asyncio.gather(
+                asyncio.to_thread(self.vector_store.search_batch, queries, top_k),
+                asyncio.gather(*[_graph_and_bm25(query) for query in queries])
+            )
+
+            return [
+                self._merge_results(
+                    [vector_results, graph_results, bm25_results],
+                    weights=[0.6, 0.1, 0.3],
+                    top_k=top_k
+                )
+                for vector_results, (graph_results, bm25_results)
+                in zip(vector_lists, other_lists)
+            ]
+
+        async def _one(query):
+            async with semaphore:
+                return await self.aretrieve(query, top_k=top_k, strategy=strategy)
+
+        return await asyncio.gather(*[_one(query) for query in queries])
+
+    def iter_retrieve(self, query, top_k=5, strategy="hybrid"):
+        """
+        Generator variant of retrieve() that yields results as they arrive.
+
+        For single-strategy retrieval this simply streams that backend's
+        results. For hybrid, the three backends run concurrently and each
+        backend's results are yielded as soon as that backend completes
+        (deduplicated by node_id), so a consumer can start rendering after
+        the fastest backend instead of waiting for the slowest. Note: the
+        streamed order reflects backend completion, not the fused RRF
+        ranking - use retrieve() when the final ranking matters.
+        """
+        if strategy == "vector_only":
+            yield from self.vector_store.search(query, top_k)
+            return
+        elif strategy == "graph_only":
+            yield from self.graph_store.search(query, top_k)
+            return
+        elif strategy == "bm25_only":
+            yield from self._bm25_search(query, top_k)
+            return
+
+        seen_ids = set()
+        futures = [
+            self._submit_traced(self._vector_search_traced, query, top_k),
+            self._submit_traced(self._graph_search_traced, query, top_k),
+            self._submit_traced(self._bm25_search_traced, query, top_k),
+        ]
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception:
+                continue
+            for node in results:
+                if node.node.node_id not in seen_ids:
+                    seen_ids.add(node.node.node_id)
+                    yield node
+
+    def _submit_traced(self, fn, *args):
+        """
+        Submit a search to the pool with the caller's contextvars attached.
+
+        langsmith's @traceable tracks the active trace in a contextvar,
+        which executor threads don't inherit - submitted bare, the backend
+        spans would surface as orphaned roots instead of nesting under the
+        caller's trace.
+        """
+        return self._executor.submit(contextvars.copy_context().run, fn, *args)
+
     @traceable(name="vector_search", tags=["retrieval", "vector"])
     def _vector_search_traced(self, query, top_k):
         """Vector search with tracing"""
@@ -111,17 +349,28 @@ class HybridRetriever:
         if not self.bm25_retriever:
             docs_path = Path(__file__).parent.parent / "data" / "sample_documents"
             if docs_path.exists():
-                documents = SimpleDirectoryReader(str(docs_path)).load_data()
-                nodes = [TextNode(text=doc.text, metadata=doc.metadata) for doc in documents]
-                if nodes:
-                    self.bm25_retriever = BM25Retriever.from_defaults(
-                        nodes=nodes,
-                        similarity_top_k=top_k
+                fingerprint = self._corpus_fingerprint(docs_path)
+                if fingerprint is not None:
+                    self.bm25_retriever = _build_or_load_bm25(
+                        str(docs_path), fingerprint, top_k
                     )
-        
+
         if self.bm25_retriever:
+            # The retriever is built (and possibly shared) with the top_k of
+            # whoever touched it first; honor this call's top_k instead
+            if self.bm25_retriever.similarity_top_k != top_k:
+                self.bm25_retriever.similarity_top_k = top_k
             return self.bm25_retriever.retrieve(query)
         return []
+
+    @staticmethod
+    def _corpus_fingerprint(docs_path):
+        """Cheap corpus version key: file count + newest mtime."""
+        files = [p for p in Path(docs_path).glob("**/*") if p.is_file()]
+        if not files:
+            return None
+        latest_mtime = max(p.stat().st_mtime_ns for p in files)
+        return f"{len(files)}-{latest_mtime}"
     
     @traceable(name="rrf_merge", tags=["retrieval", "fusion"])
     def _merge_results(self, results_list, weights, top_k):
@@ -143,83 +392,160 @@ class HybridRetriever:
             weights: List of [vector_weight, graph_weight, bm25_weight]
             top_k: Final number of results
         """
-        scores = {}
-        k = 60  # RRF constant
-        
-        # Track individual scores per method for tracing
+        # No backend can contribute more than top_k to the final ranking;
+        # slicing up front bounds the merge work even if a backend returns
+        # extra rows (e.g. a shared BM25 retriever built with a larger k)
+        results_list = [results[:top_k] for results in results_list]
+
+        k = _RRF_K
+        rrf_lut = self._get_rrf_lut(weights)
+
+        # Short-circuit the low-recall case: when every candidate fits in
+        # the answer anyway (common when graph search comes back empty),
+        # score and dedup by node_id in one small pass and skip the
+        # text-hash machinery and bookkeeping entirely
+        total = sum(len(results) for results in results_list)
+        if total == 0:
+            return []
+        if total <= top_k:
+            small_scores = {}
+            small_nodes = {}
+            for method_idx, results in enumerate(results_list):
+                method_lut = rrf_lut[method_idx]
+                weight = weights[method_idx]
+                for rank, node in enumerate(results):
+                    node_id = node.node.node_id
+                    rrf_score = (
+                        float(method_lut[rank]) if rank < _RRF_LUT_RANKS
+                        else weight / (k + rank + 1)
+                    )
+                    small_scores[node_id] = small_scores.get(node_id, 0.0) + rrf_score
+                    small_nodes.setdefault(node_id, node)
+            merged = [
+                NodeWithScore(node=small_nodes[node_id].node, score=score)
+                for node_id, score in sorted(
+                    small_scores.items(), key=operator.itemgetter(1), reverse=True
+                )
+            ]
+            return self._attach_previews(merged)
+
         method_names = ["vector", "graph", "bm25"]
-        score_breakdown = {method: {} for method in method_names}
-        
-        # Process each retriever's results
-        for method_name, results, weight in zip(method_names, results_list, weights):
+        # Per-method breakdown only exists when someone will read it
+        score_breakdown = (
+            {method: {} for method in method_names}
+            if self.verbose and logger.isEnabledFor(logging.DEBUG) else None
+        )
+
+        # Single pass over every (method, rank, node): RRF accumulation,
+        # node collection, and the text-hash dedup map update in lockstep,
+        # instead of re-walking the result lists once per concern. Each
+        # first-seen node_id gets a dense int index so the hot loop
+        # accumulates into plain lists; only the first sighting pays for
+        # hashing the UUID-like node_id string
+        id2idx = {}
+        scores_arr = []
+        nodes_arr = []
+        text_to_idxs = {}
+        for method_idx, (method_name, results, weight) in enumerate(
+            zip(method_names, results_list, weights)
+        ):
+            method_lut = rrf_lut[method_idx]
             for rank, node in enumerate(results):
                 node_id = node.node.node_id
-                rrf_score = weight / (k + rank + 1)
-                scores[node_id] = scores.get(node_id, 0) + rrf_score
-                
-                # Track breakdown per method
-                score_breakdown[method_name][node_id] = {
-                    "rank": rank + 1,
-                    "weight": weight,
-                    "rrf_score": rrf_score
-                }
-        
-        # Log score breakdown if verbose
-        if self.verbose:
-            print(f"\n   📊 RRF Score Breakdown (top 3):")
-            sorted_by_score = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:3]
+                rrf_score = (
+                    method_lut[rank] if rank < _RRF_LUT_RANKS
+                    else weight / (k + rank + 1)
+                )
+
+                idx = id2idx.get(node_id)
+                if idx is None:
+                    idx = len(scores_arr)
+                    id2idx[node_id] = idx
+                    scores_arr.append(0.0)
+                    nodes_arr.append(node)
+                    # 64-bit fingerprint of the first 200 chars: an 8-byte
+                    # int key hashes in one shot instead of re-hashing a
+                    # 200-char substring on every dict probe. Nodes from
+                    # the BM25 corpus carry the key precomputed at ingest.
+                    text_key = node.node.metadata.get('_dedup_key')
+                    if text_key is None:
+                        text_key = xxhash.xxh3_64_intdigest(
+                            node.node.text[:200].encode('utf-8', 'ignore')
+                        )
+                    text_to_idxs.setdefault(text_key, []).append(idx)
+                scores_arr[idx] += rrf_score
+
+                if score_breakdown is not None:
+                    score_breakdown[method_name][node_id] = {
+                        "rank": rank + 1,
+                        "weight": weight,
+                        "rrf_score": rrf_score
+                    }
+
+        # Log score breakdown if verbose AND debug logging is actually on -
+        # the nested formatting loops are skipped entirely otherwise
+        if self.verbose and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n   📊 RRF Score Breakdown (top 3):")
+            sorted_by_score = sorted(
+                ((nodes_arr[i].node.node_id, scores_arr[i]) for i in range(len(scores_arr))),
+                key=operator.itemgetter(1), reverse=True
+            )[:3]
             for node_id, total_score in sorted_by_score:
-                print(f"   Node {node_id[:12]}... : {total_score:.4f}")
+                logger.debug("   Node %.12s... : %.4f", node_id, total_score)
                 for method in method_names:
                     if node_id in score_breakdown[method]:
                         info = score_breakdown[method][node_id]
-                        print(f"      {method:8} → rank {info['rank']:2} × {info['weight']:.1f} = {info['rrf_score']:.4f}")
-        
-        # Combine all unique nodes
-        all_nodes = {}
-        for results in results_list:
-            for node in results:
-                all_nodes[node.node.node_id] = node
-        
-        # DEDUPLICATION STEP: Identify duplicates by text content
-        # Map text hash -> list of node_ids with that text
-        text_to_nodes = {}
-        for node_id, node_with_score in all_nodes.items():
-            # Use first 200 chars as hash key (handles slight variations)
-            text_key = node_with_score.node.text[:200].strip()
-            if text_key not in text_to_nodes:
-                text_to_nodes[text_key] = []
-            text_to_nodes[text_key].append(node_id)
-        
+                        logger.debug("      %-8s → rank %2d × %.1f = %.4f",
+                                     method, info['rank'], info['weight'], info['rrf_score'])
+
         # Count duplicates found
-        total_before_dedup = len(all_nodes)
-        num_duplicate_groups = sum(1 for node_ids in text_to_nodes.values() if len(node_ids) > 1)
-        
-        # Merge scores for duplicate content, keep highest-scored node_id
+        total_before_dedup = len(nodes_arr)
+        num_duplicate_groups = sum(1 for idxs in text_to_idxs.values() if len(idxs) > 1)
+
+        # Merge scores for duplicate content, keep highest-scored index
         deduped_scores = {}
-        deduped_nodes = {}
-        for text_key, node_ids in text_to_nodes.items():
-            # Sum scores from all duplicate node_ids
-            merged_score = sum(scores.get(nid, 0) for nid in node_ids)
+        for idxs in text_to_idxs.values():
+            # Sum scores from all duplicate indices
+            merged_score = sum(scores_arr[i] for i in idxs)
             # Keep the node with highest individual score as representative
-            best_node_id = max(node_ids, key=lambda nid: scores.get(nid, 0))
-            deduped_scores[best_node_id] = merged_score
-            deduped_nodes[best_node_id] = all_nodes[best_node_id]
-        
+            best_idx = max(idxs, key=scores_arr.__getitem__)
+            deduped_scores[best_idx] = merged_score
+
         # Log deduplication stats if verbose
         if self.verbose:
-            total_after_dedup = len(deduped_nodes)
+            total_after_dedup = len(deduped_scores)
             duplicates_removed = total_before_dedup - total_after_dedup
             if duplicates_removed > 0:
-                print(f"   🔄 Deduplication: {total_before_dedup} → {total_after_dedup} docs "
-                      f"({duplicates_removed} duplicates removed in {num_duplicate_groups} groups)")
-        
-        # Sort by merged score
-        sorted_ids = sorted(deduped_scores.keys(), key=lambda x: deduped_scores[x], reverse=True)
-        
-        # Return top-k with new scores
-        return [
-            NodeWithScore(node=deduped_nodes[node_id].node, score=deduped_scores[node_id])
-            for node_id in sorted_ids[:top_k]
-            if node_id in deduped_nodes
+                logger.debug("   🔄 Deduplication: %d → %d docs "
+                             "(%d duplicates removed in %d groups)",
+                             total_before_dedup, total_after_dedup,
+                             duplicates_removed, num_duplicate_groups)
+
+        # Top-k by merged score: O(N log k) heap selection instead of a
+        # full sort, and itemgetter avoids a Python lambda per comparison
+        top_items = heapq.nlargest(
+            top_k, deduped_scores.items(), key=operator.itemgetter(1)
+        )
+
+        merged = [
+            NodeWithScore(node=nodes_arr[idx].node, score=float(score))
+            for idx, score in top_items
         ]
+
+        return self._attach_previews(merged)
+
+    @staticmethod
+    def _attach_previews(merged):
+        """
+        Stash truncated views once: downstream agents re-slice doc text
+        on every review/answer iteration, so precomputing the previews
+        keeps that allocation out of the retry loop.
+        """
+        for node_with_score in merged:
+            metadata = node_with_score.node.metadata
+            if '_preview_150' not in metadata:
+                text = node_with_score.node.text
+                metadata['_preview_150'] = text[:150]
+                metadata['_preview_1000'] = text[:1000]
+
+        return merged